@@ -17,6 +17,9 @@ class PatternRegistry:
     great_spells: dict[frozenset[Segment], str] = field(default_factory=dict)
 
 class Iota:
+    # (initial direction, turns) of the pattern this iota was decoded from, if any
+    glyph: tuple[Direction, str] | None = None
+
     def __init__(self, datum):
         self._datum = datum
     def color(self) -> str:
@@ -57,6 +60,14 @@ class ListCloser(Iota):
     def preadjust(self, level: int) -> int:
         return level - 1
 
+class PageHeader(Iota):
+    def presentation_name(self):
+        return f"=== {self._datum} ==="
+    def localize(self, translation_table):
+        return self.presentation_name()
+    def print(self, level: int, highlight: bool, translation_table={}):
+        print("===", self._datum, "===")
+
 class Pattern(Iota):
     def color(self):
         return fg.yellow
@@ -68,6 +79,7 @@ class Unknown(Iota):
 class UnknownPattern(Unknown):
     def __init__(self, initial_direction, turns):
         self._initial_direction = initial_direction
+        self.glyph = (initial_direction, turns)
         super().__init__(turns)
     def presentation_name(self):
         return f"unknown: {self._initial_direction.name} {self._datum}"
@@ -417,6 +429,25 @@ def _handle_named_pattern(name: str):
         case _:
             return Pattern(name)
 
+def _classify_pattern(pattern: UnknownPattern, registry: PatternRegistry) -> Iota:
+    if ((name := registry.spells.get(pattern._datum)) or
+            (segments := _get_pattern_segments(pattern._initial_direction, pattern._datum)) and
+            (name := registry.great_spells.get(segments))):
+        return _handle_named_pattern(name)
+    elif pattern._datum == "qqq":
+        return _handle_named_pattern("open_paren")
+    elif pattern._datum == "eee":
+        return _handle_named_pattern("close_paren")
+    elif pattern._datum == "qqqaw":
+        return _handle_named_pattern("escape")
+    elif bk := _parse_bookkeeper(pattern._initial_direction,
+                                 pattern._datum):
+        return Bookkeeper(bk)
+    elif pattern._datum.startswith(("aqaa", "dedd")):
+        return _parse_number(pattern._datum)
+    else:
+        return pattern
+
 def massage_raw_pattern_list(pattern, registry: PatternRegistry) -> Generator[Iota, None, None]:
     match pattern:
         case [*subpatterns]:
@@ -425,22 +456,8 @@ def massage_raw_pattern_list(pattern, registry: PatternRegistry) -> Generator[Io
                 yield from massage_raw_pattern_list(subpattern, registry)
             yield ListCloser("]")
         case UnknownPattern():
-            if ((name := registry.spells.get(pattern._datum)) or
-                    (segments := _get_pattern_segments(pattern._initial_direction, pattern._datum)) and
-                    (name := registry.great_spells.get(segments))):
-                yield _handle_named_pattern(name)
-            elif pattern._datum == "qqq":
-                yield _handle_named_pattern("open_paren")
-            elif pattern._datum == "eee":
-                yield _handle_named_pattern("close_paren")
-            elif pattern._datum == "qqqaw":
-                yield _handle_named_pattern("escape")
-            elif bk := _parse_bookkeeper(pattern._initial_direction,
-                                         pattern._datum):
-                yield Bookkeeper(bk)
-            elif pattern._datum.startswith(("aqaa", "dedd")):
-                yield _parse_number(pattern._datum)
-            else:
-                yield pattern
+            iota = _classify_pattern(pattern, registry)
+            iota.glyph = pattern.glyph
+            yield iota
         case other:
             yield other
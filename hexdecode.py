@@ -1,11 +1,13 @@
 from __future__ import annotations
 import revealparser
 import kjsparser
+import hexdiff
+import hexsvg
 import argparse
 import json
 import pickle
 import fileinput
-from hexast import massage_raw_pattern_list, PatternRegistry
+from hexast import massage_raw_pattern_list, PatternRegistry, PageHeader
 import signal
 import sys
 
@@ -21,9 +23,51 @@ parser.add_argument('--kubejs',
 parser.add_argument('--highlight',
                     help="Whether or not to highlight the structure",
                     action='store_true')
+mode = parser.add_mutually_exclusive_group()
+mode.add_argument('--diff',
+                  help="Show what changed between two hexes read from files; exits with 1 if they differ",
+                  nargs=2,
+                  metavar=('OLD', 'NEW'))
+mode.add_argument('--svg',
+                  help="Render the whole input as one SVG document with each pattern drawn",
+                  action='store_true')
+parser.add_argument('--glyph-cache',
+                    help="File to keep drawn patterns in between runs (with --svg)",
+                    default=None)
+
+def _levelled(iotas):
+    level = 0
+    for iota in iotas:
+        level = iota.preadjust(level)
+        yield level, iota
+        level = iota.postadjust(level)
+
+def sections(lines, kubejs, registry):
+    # each kubejs page, or each line of reveal output, is decoded starting from level 0
+    for line in lines:
+        if kubejs:
+            for page_name, iotas in kjsparser.parse(line):
+                yield PageHeader(page_name), massage_raw_pattern_list(iotas, registry)
+        else:
+            yield None, (iota
+                         for pattern in revealparser.parse(line)
+                         for iota in massage_raw_pattern_list(pattern, registry))
+
+def decode(lines, kubejs, registry):
+    for header, iotas in sections(lines, kubejs, registry):
+        if header is not None:
+            yield 0, header
+        yield from _levelled(iotas)
+
+def read_tree(path, kubejs, registry):
+    with open(path, "r", encoding="utf-8") as file:
+        lines = [line for line in file if line.strip()]
+    return hexdiff.build_pages(sections(lines, kubejs, registry))
 
 if __name__ == "__main__":
     args = parser.parse_args()
+    if args.glyph_cache and not args.svg:
+        parser.error("--glyph-cache only applies with --svg")
 
     with open(args.registry, "rb") as file:
         registry: PatternRegistry = pickle.load(file)
@@ -34,20 +78,15 @@ if __name__ == "__main__":
     else:
         translation_table = {}
 
-    if args.kubejs:
-        for line in fileinput.input(files=[], encoding="utf-8"):
-            for page_name, iotas in kjsparser.parse(line):
-                print("===", page_name, "===")
-                level = 0
-                for iota in massage_raw_pattern_list(iotas, registry):
-                    level = iota.preadjust(level)
-                    iota.print(level, args.highlight, translation_table)
-                    level = iota.postadjust(level)
+    if args.diff:
+        old, new = (read_tree(path, args.kubejs, registry) for path in args.diff)
+        # same convention as diff(1): 0 if nothing changed, 1 otherwise
+        sys.exit(1 if hexdiff.diff(old, new, args.highlight, translation_table) else 0)
+    elif args.svg:
+        store = hexsvg.GlyphStore(args.glyph_cache)
+        rows = decode(fileinput.input(files=[], encoding="utf-8"), args.kubejs, registry)
+        print(hexsvg.render(rows, store, translation_table))
+        store.save()
     else:
-        for line in fileinput.input(files=[], encoding="utf-8"):
-            level = 0
-            for pattern in revealparser.parse(line):
-                for iota in massage_raw_pattern_list(pattern, registry):
-                    level = iota.preadjust(level)
-                    iota.print(level, args.highlight, translation_table)
-                    level = iota.postadjust(level)
+        for level, iota in decode(fileinput.input(files=[], encoding="utf-8"), args.kubejs, registry):
+            iota.print(level, args.highlight, translation_table)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+import hashlib
+from typing import Iterable
+from sty import fg
+from hexast import Iota, ListOpener, ListCloser, PatternOpener, PatternCloser
+
+# which opener a given closer is allowed to close
+_closes = {ListCloser: ListOpener, PatternCloser: PatternOpener}
+
+def _key(iota: Iota | None) -> tuple[str, str] | None:
+    return (type(iota).__name__, iota.presentation_name()) if iota is not None else None
+
+def _digest(*parts) -> bytes:
+    # collision resistant, so matching digests can be trusted to mean matching subtrees
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+def _shift(iota: Iota | None) -> int:
+    # net change in indentation, so unchanged subtrees can be skipped without walking them
+    return iota.postadjust(iota.preadjust(0)) if iota is not None else 0
+
+@dataclass(eq=False)
+class Leaf:
+    iota: Iota
+    key: tuple = field(init=False)
+    digest: bytes = field(init=False)
+    shift: int = field(init=False)
+    size: int = field(default=1, init=False)
+
+    def __post_init__(self):
+        self.key = _key(self.iota)
+        self.digest = _digest(repr(self.key).encode())
+        self.shift = _shift(self.iota)
+
+@dataclass(eq=False)
+class Block:
+    # opener is None for a block that just groups one line of input
+    opener: Iota | None
+    children: list[Leaf | Block] = field(default_factory=list)
+    closer: Iota | None = None
+    key: tuple = field(init=False)
+    digest: bytes = field(init=False)
+    shift: int = field(init=False)
+    size: int = field(init=False)
+
+    def seal(self) -> Block:
+        # hash the subtree once its contents are known, so equal subtrees compare in O(1)
+        self.key = _key(self.opener)
+        # child digests are fixed length, so concatenating them is unambiguous
+        self.digest = _digest(repr((self.key, _key(self.closer))).encode(),
+                              *(child.digest for child in self.children))
+        self.shift = _shift(self.opener) + sum(child.shift for child in self.children) + _shift(self.closer)
+        # page headers and line groupings aren't iotas, so they don't count towards the size
+        self.size = (sum(child.size for child in self.children) +
+                     isinstance(self.opener, (ListOpener, PatternOpener)) +
+                     (self.closer is not None))
+        return self
+
+def build_tree(iotas: Iterable[Iota]) -> list[Leaf | Block]:
+    root: list[Leaf | Block] = []
+    stack: list[Block] = []
+    for iota in iotas:
+        siblings = stack[-1].children if stack else root
+        if isinstance(iota, (ListOpener, PatternOpener)):
+            block = Block(iota)
+            siblings.append(block)
+            stack.append(block)
+        elif type(iota) in _closes and any(isinstance(block.opener, _closes[type(iota)]) for block in stack):
+            # a list closing over an unbalanced { leaves that pattern block unclosed
+            while not isinstance(stack[-1].opener, _closes[type(iota)]):
+                stack.pop().seal()
+            block = stack.pop()
+            block.closer = iota
+            block.seal()
+        else:
+            siblings.append(Leaf(iota))
+    while stack:
+        stack.pop().seal()
+    return root
+
+def build_pages(pages: Iterable[tuple[Iota | None, Iterable[Iota]]]) -> list[Leaf | Block]:
+    # one block per page or line, so indentation resets at each one just like the text output
+    return [Block(header, build_tree(iotas)).seal() for header, iotas in pages]
+
+class _Printer:
+    def __init__(self, highlight: bool, translation_table):
+        self._highlight = highlight
+        self._translation_table = translation_table
+
+    def line(self, mark: str, level: int, iota: Iota):
+        indent = "  " * level
+        datum_name = iota.localize(self._translation_table)
+        if self._highlight:
+            mark = {"-": fg.li_red + "-" + fg.rs, "+": fg.li_green + "+" + fg.rs}.get(mark, mark)
+            print(mark + " " + indent + iota.color() + datum_name + fg.rs)
+        else:
+            print(mark + " " + indent + datum_name)
+
+    def unchanged(self, level: int, count: int):
+        indent = "  " * level
+        print("  " + indent + f"... ({count} unchanged)")
+
+    def subtree(self, mark: str, level: int, node: Leaf | Block) -> int:
+        match node:
+            case Leaf(iota=iota):
+                level = iota.preadjust(level)
+                self.line(mark, level, iota)
+                return iota.postadjust(level)
+            case Block(opener=None, children=children):
+                inner = 0
+                for child in children:
+                    inner = self.subtree(mark, inner, child)
+                return level
+            case Block(opener=opener, children=children, closer=closer):
+                level = opener.preadjust(level)
+                self.line(mark, level, opener)
+                inner = opener.postadjust(level)
+                for child in children:
+                    inner = self.subtree(mark, inner, child)
+                if closer is None:
+                    return inner
+                level = closer.preadjust(inner)
+                self.line(mark, level, closer)
+                return closer.postadjust(level)
+
+def _diff_blocks(printer: _Printer, level: int, old: Block, new: Block) -> int:
+    if new.opener is None:
+        _diff_children(printer, 0, old.children, new.children)
+        return level
+    level = new.opener.preadjust(level)
+    printer.line(" ", level, new.opener)
+    inner = _diff_children(printer, new.opener.postadjust(level), old.children, new.children)
+    if old.closer is None and new.closer is None:
+        return inner
+    if old.closer is not None and new.closer is not None:
+        level = new.closer.preadjust(inner)
+        printer.line(" ", level, new.closer)
+        return new.closer.postadjust(level)
+    if old.closer is not None:
+        level = old.closer.preadjust(inner)
+        printer.line("-", level, old.closer)
+        return inner
+    level = new.closer.preadjust(inner)
+    printer.line("+", level, new.closer)
+    return new.closer.postadjust(level)
+
+def _diff_changed(printer: _Printer, level: int, old: list[Leaf | Block], new: list[Leaf | Block]) -> int:
+    # nothing in here matched by digest, so pair up blocks of the same kind and look inside them
+    matcher = SequenceMatcher(None, [node.key for node in old], [node.key for node in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for old_node, new_node in zip(old[i1:i2], new[j1:j2]):
+                if isinstance(old_node, Block) and isinstance(new_node, Block):
+                    level = _diff_blocks(printer, level, old_node, new_node)
+                else:
+                    level = printer.subtree(" ", level, new_node)
+            continue
+        # removed lines don't exist in the new hex, so only additions move the indentation
+        for node in old[i1:i2]:
+            printer.subtree("-", level, node)
+        for node in new[j1:j2]:
+            level = printer.subtree("+", level, node)
+    return level
+
+def _diff_children(printer: _Printer, level: int, old: list[Leaf | Block], new: list[Leaf | Block]) -> int:
+    matcher = SequenceMatcher(None, [node.digest for node in old], [node.digest for node in new], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            printer.unchanged(level, sum(node.size for node in new[j1:j2]))
+            level += sum(node.shift for node in new[j1:j2])
+        else:
+            level = _diff_changed(printer, level, old[i1:i2], new[j1:j2])
+    return level
+
+def diff(old: list[Leaf | Block], new: list[Leaf | Block], highlight: bool, translation_table={}) -> bool:
+    if [node.digest for node in old] == [node.digest for node in new]:
+        return False
+    _diff_children(_Printer(highlight, translation_table), 0, old, new)
+    return True
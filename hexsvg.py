@@ -0,0 +1,105 @@
+from __future__ import annotations
+import os
+import pickle
+from math import sqrt
+from typing import Iterable
+from xml.sax.saxutils import escape
+from hexast import Iota, Direction, _get_segments
+
+ROW_HEIGHT = 32
+GLYPH_SIZE = 28
+INDENT = 24
+CHAR_WIDTH = 8 # rough width of a monospace character at the label font size
+STROKE_WIDTH = 1.5
+DOT_RADIUS = 2
+
+# bump whenever _trace changes its output, so existing glyph caches get thrown away
+GLYPH_VERSION = 1
+
+def _to_pixel(q: int, r: int) -> tuple[float, float]:
+    # axial coordinates on a grid where EAST is horizontal and edges have length 1
+    return (q + r / 2, r * sqrt(3) / 2)
+
+def glyph_id(direction: Direction, turns: str) -> str:
+    return f"{direction.name}_{turns}"
+
+def _trace(direction: Direction, turns: str) -> str:
+    lines = []
+    points = []
+    # sorted so the same pattern always serializes to the same markup
+    for segment in sorted(_get_segments(direction, turns),
+                          key=lambda segment: (segment.root.q, segment.root.r, segment.direction.value)):
+        start = _to_pixel(segment.root.q, segment.root.r)
+        end = _to_pixel(segment.end.q, segment.end.r)
+        points += [start, end]
+        lines.append(f"M{start[0]:g} {start[1]:.3f}L{end[0]:g} {end[1]:.3f}")
+
+    pad = 0.5
+    min_x = min(x for x, _ in points) - pad
+    min_y = min(y for _, y in points) - pad
+    width = max(x for x, _ in points) - min_x + pad
+    height = max(y for _, y in points) - min_y + pad
+    # every glyph is drawn in the same GLYPH_SIZE box, so convert pixel sizes into this viewBox's units
+    scale = max(width, height) / GLYPH_SIZE
+    # patterns always start at the origin, so mark it to show where the stroke begins
+    return (f'<symbol id="{glyph_id(direction, turns)}" viewBox="{min_x:g} {min_y:.3f} {width:g} {height:.3f}">'
+            f'<path d="{"".join(lines)}" fill="none" stroke="currentColor" stroke-width="{STROKE_WIDTH * scale:.3f}" stroke-linecap="round"/>'
+            f'<circle cx="0" cy="0" r="{DOT_RADIUS * scale:.3f}" fill="currentColor"/>'
+            f'</symbol>')
+
+class GlyphStore:
+    def __init__(self, path: str | None = None):
+        self._path = path
+        self._glyphs: dict[tuple[Direction, str], str] = {}
+        self._dirty = False
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as file:
+                cached = pickle.load(file)
+            # glyphs from a different version of _trace are stale, so start over
+            if isinstance(cached, dict) and cached.get("version") == GLYPH_VERSION:
+                self._glyphs = cached["glyphs"]
+
+    def symbol(self, direction: Direction, turns: str) -> str:
+        key = (direction, turns)
+        if key not in self._glyphs:
+            self._glyphs[key] = _trace(direction, turns)
+            self._dirty = True
+        return self._glyphs[key]
+
+    def save(self):
+        if self._path is None or not self._dirty:
+            return
+        with open(self._path, "wb") as file:
+            pickle.dump({"version": GLYPH_VERSION, "glyphs": self._glyphs}, file)
+        self._dirty = False
+
+def render(rows: Iterable[tuple[int, Iota]], store: GlyphStore, translation_table={}) -> str:
+    symbols: dict[str, str] = {}
+    body = []
+    width = 0
+    y = 0
+    for level, iota in rows:
+        x = INDENT * level
+        if iota.glyph is not None:
+            direction, turns = iota.glyph
+            name = glyph_id(direction, turns)
+            if name not in symbols:
+                symbols[name] = store.symbol(direction, turns)
+            body.append(f'<use href="#{name}" x="{x}" y="{y + (ROW_HEIGHT - GLYPH_SIZE) // 2}" '
+                        f'width="{GLYPH_SIZE}" height="{GLYPH_SIZE}"/>')
+            x += GLYPH_SIZE + CHAR_WIDTH
+        label = iota.localize(translation_table)
+        body.append(f'<text x="{x}" y="{y + ROW_HEIGHT // 2}" dominant-baseline="middle">{escape(label)}</text>')
+        width = max(width, x + CHAR_WIDTH * len(label))
+        y += ROW_HEIGHT
+
+    # every distinct pattern is defined once and referenced by every row that uses it
+    return "\n".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{y}" viewBox="0 0 {width} {y}" '
+        f'font-family="monospace" font-size="14">',
+        "<defs>",
+        *symbols.values(),
+        "</defs>",
+        *body,
+        "</svg>",
+    ])